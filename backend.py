@@ -5,6 +5,9 @@ import json
 import os
 import logging
 from .src.project_progres.crew import ProjectProgres
+from llm_admission import get_admission_controller
+from progress_store import BurndownPoint, ListCycleTime, MemberVelocity, get_progress_store
+from typing import List
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -98,6 +101,39 @@ def run_CrewAI_progress() -> None:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.get("/progress/burndown", response_model=List[BurndownPoint], status_code=200)
+def get_progress_burndown(start: str, end: str) -> List[BurndownPoint]:
+    """
+    Return the daily open, done and overdue card counts between start and end (YYYY-MM-DD).
+    """
+    try:
+        return get_progress_store().burndown(start, end)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
+@app.get("/progress/velocity", response_model=List[MemberVelocity], status_code=200)
+def get_progress_velocity(start: str, end: str, window_days: int = 7) -> List[MemberVelocity]:
+    """
+    Return the cards each member completed between start and end (YYYY-MM-DD), per window of window_days.
+    """
+    try:
+        return get_progress_store().velocity(start, end, window_days)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
+@app.get("/progress/cycle-time", response_model=List[ListCycleTime], status_code=200)
+def get_progress_cycle_time(start: str, end: str) -> List[ListCycleTime]:
+    """
+    Return the average days cards spent in each list, for cards that left a list between start and end (YYYY-MM-DD).
+    """
+    try:
+        return get_progress_store().cycle_time(start, end)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
+@app.get("/metrics/llm", status_code=200)
+def get_llm_admission_metrics() -> dict:
+    """
+    Return the shared LLM admission controller state: bucket levels and per-lane queue metrics.
+    """
+    return get_admission_controller().snapshot()
@@ -10,6 +10,8 @@ import os
 
 # Add the src directory to the Python path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+# The progress crew and the shared LLM admission module are imported as top-level modules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src', 'project_progres'))
 
 if __name__ == "__main__":
     uvicorn.run(
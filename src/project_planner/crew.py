@@ -4,6 +4,7 @@ from crewai.project import CrewBase, agent, crew, task
 from crewai.agents.agent_builder.base_agent import BaseAgent
 from typing import List
 from .models import ProjectPlan
+from llm_admission import AdmittedLLM, Lane
 
 @CrewBase
 class ProjectPlanner():
@@ -18,6 +19,7 @@ class ProjectPlanner():
         return Agent(
             config=self.agents_config['project_planner_agent'], # type: ignore[index]
             verbose=True,
+            llm=AdmittedLLM(lane=Lane.BATCH),
             allow_delegation=False
         )
 
@@ -26,6 +28,7 @@ class ProjectPlanner():
         return Agent(
             config=self.agents_config['estimation_agent'], # type: ignore[index]
             verbose=True,
+            llm=AdmittedLLM(lane=Lane.BATCH),
             allow_delegation=False
         )
     @agent
@@ -33,6 +36,7 @@ class ProjectPlanner():
         return Agent(
             config=self.agents_config['resource_allocation_agent'], # type: ignore[index]
             verbose=True,
+            llm=AdmittedLLM(lane=Lane.BATCH),
             allow_delegation=False
         )  
 
@@ -1,8 +1,13 @@
 from crewai import Agent, Crew, Process, Task
-from crewai.project import CrewBase, agent, crew, task
+from crewai.project import CrewBase, agent, crew, task, after_kickoff
 from crewai.agents.agent_builder.base_agent import BaseAgent
+import logging
 from typing import List
 from tools import TrelloBoardDataFetcherTool, TrelloCardDataFetcherTool, TrelloUserDataFetcherTool
+from llm_admission import AdmittedLLM, Lane
+from progress_store import record_board_snapshot
+
+logger = logging.getLogger(__name__)
 
 @CrewBase
 class ProjectProgres():
@@ -15,6 +20,7 @@ class ProjectProgres():
         return Agent(
             config=self.agents_config['data_collection_agent'], # type: ignore[index]
             verbose=True,
+            llm=AdmittedLLM(lane=Lane.INTERACTIVE),
             tools=[TrelloBoardDataFetcherTool(),TrelloCardDataFetcherTool(),TrelloUserDataFetcherTool()],
             allow_delegation=False
         )
@@ -24,6 +30,7 @@ class ProjectProgres():
         return Agent(
             config=self.agents_config['analysis_agent'], # type: ignore[index]
             verbose=True,
+            llm=AdmittedLLM(lane=Lane.INTERACTIVE),
             allow_delegation=False
         )
     @task
@@ -45,6 +52,15 @@ class ProjectProgres():
             output_file='report.md'
         )
 
+    @after_kickoff
+    def record_progress_snapshot(self, output):
+        """Append the board metrics behind this run to the progress store"""
+        try:
+            record_board_snapshot()
+        except Exception as e:
+            logger.error(f"Failed to record progress snapshot: {str(e)}")
+        return output
+
     @crew
     def crew(self) -> Crew:
         """Creates the ProjectProgres crew"""
@@ -0,0 +1,288 @@
+"""
+Global LLM Admission Controller
+
+The ProjectPlanner and ProjectProgres crews share one provider quota. This module
+puts a single process-wide admission layer in front of every agent LLM call so
+bursts of planning work cannot exhaust the quota and stall interactive progress
+refreshes.
+
+Both crews and the backend import this module as the top-level `llm_admission`
+(the same way the progress crew imports `tools`), so a process only ever holds
+one copy of it and one controller.
+
+Each call is admitted against two token buckets (requests per minute and tokens
+per minute) after estimating its token cost. Waiting calls are queued in priority
+lanes: interactive calls are always admitted before batch calls.
+"""
+
+import logging
+import os
+import threading
+import time
+from collections import deque
+from enum import Enum
+from typing import Any, Deque, Dict, List, Optional, Union
+
+from crewai import LLM
+
+logger = logging.getLogger(__name__)
+
+# Rough number of characters per token for English prompts
+CHARS_PER_TOKEN = 4
+# Tokens reserved for the completion when the LLM has no max_tokens set
+DEFAULT_COMPLETION_TOKENS = 1024
+# Times a rate limited call is re-admitted and retried before the 429 is raised;
+# crewAI does not retry provider errors itself
+RATE_LIMIT_RETRIES = int(os.getenv("LLM_RATE_LIMIT_RETRIES", "3"))
+
+
+class Lane(str, Enum):
+    """Priority lanes for LLM calls, in admission order"""
+    INTERACTIVE = "interactive"
+    BATCH = "batch"
+
+
+class TokenBucket:
+    """Token bucket refilled continuously up to a per-minute capacity.
+
+    Not thread safe on its own; the AdmissionController guards all access.
+    """
+
+    def __init__(self, per_minute: float):
+        self.capacity = float(per_minute)
+        self.rate = self.capacity / 60.0
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+    def refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def clamp(self, amount: float) -> float:
+        """Cap a request at the bucket capacity so oversized calls can still run."""
+        return min(amount, self.capacity)
+
+    def wait_time(self, amount: float) -> float:
+        """Seconds until `amount` tokens are available (0 if available now)."""
+        deficit = self.clamp(amount) - self.tokens
+        return max(0.0, deficit / self.rate)
+
+    def consume(self, amount: float) -> None:
+        self.tokens -= self.clamp(amount)
+
+    def refund(self, amount: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + amount)
+
+    def drain(self, now: float) -> None:
+        self.tokens = 0.0
+        self.updated = now
+
+
+class LaneMetrics:
+    """Queue-time counters for a single lane"""
+
+    def __init__(self):
+        self.admitted = 0
+        self.waiting = 0
+        self.rate_limited = 0
+        self.total_queue_seconds = 0.0
+        self.max_queue_seconds = 0.0
+        self.estimated_tokens = 0
+
+    def record(self, queue_seconds: float, tokens: int) -> None:
+        self.admitted += 1
+        self.total_queue_seconds += queue_seconds
+        self.max_queue_seconds = max(self.max_queue_seconds, queue_seconds)
+        self.estimated_tokens += tokens
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "admitted": self.admitted,
+            "waiting": self.waiting,
+            "rate_limited": self.rate_limited,
+            "avg_queue_seconds": self.total_queue_seconds / self.admitted if self.admitted else 0.0,
+            "max_queue_seconds": self.max_queue_seconds,
+            "estimated_tokens": self.estimated_tokens,
+        }
+
+
+class AdmissionController:
+    """Admits LLM calls against shared RPM/TPM token buckets with priority lanes."""
+
+    def __init__(self, requests_per_minute: float, tokens_per_minute: float):
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+        self._cond = threading.Condition()
+        self._queues: Dict[Lane, Deque[object]] = {lane: deque() for lane in Lane}
+        self._metrics: Dict[Lane, LaneMetrics] = {lane: LaneMetrics() for lane in Lane}
+        self._paused_until = 0.0
+
+    def _is_next(self, lane: Lane, ticket: object) -> bool:
+        """A ticket may proceed when it heads its lane and no higher lane is waiting."""
+        for other in Lane:
+            if other == lane:
+                return self._queues[lane][0] is ticket
+            if self._queues[other]:
+                return False
+        return False
+
+    def acquire(self, estimated_tokens: int, lane: Lane = Lane.BATCH) -> float:
+        """Block until the call may be sent. Returns the time spent queued."""
+        lane = Lane(lane)
+        ticket = object()
+        start = time.monotonic()
+        with self._cond:
+            self._queues[lane].append(ticket)
+            self._metrics[lane].waiting += 1
+            try:
+                while True:
+                    now = time.monotonic()
+                    self.requests.refill(now)
+                    self.tokens.refill(now)
+                    if self._is_next(lane, ticket):
+                        wait = max(
+                            self._paused_until - now,
+                            self.requests.wait_time(1),
+                            self.tokens.wait_time(estimated_tokens),
+                        )
+                        if wait <= 0:
+                            self.requests.consume(1)
+                            self.tokens.consume(estimated_tokens)
+                            break
+                        self._cond.wait(timeout=wait)
+                    else:
+                        self._cond.wait()
+            finally:
+                self._queues[lane].remove(ticket)
+                self._metrics[lane].waiting -= 1
+                self._cond.notify_all()
+            queued = time.monotonic() - start
+            self._metrics[lane].record(queued, estimated_tokens)
+        if queued > 0.5:
+            logger.info(f"LLM call in {lane.value} lane queued for {queued:.2f}s")
+        return queued
+
+    def reconcile(self, estimated_tokens: int, actual_tokens: int) -> None:
+        """Correct the TPM bucket once the real cost of a call is known."""
+        with self._cond:
+            self.tokens.refill(time.monotonic())
+            difference = self.tokens.clamp(estimated_tokens) - actual_tokens
+            if difference > 0:
+                self.tokens.refund(difference)
+            else:
+                self.tokens.consume(-difference)
+            self._cond.notify_all()
+
+    def penalize(self, lane: Lane, retry_after: Optional[float] = None) -> None:
+        """Back off all lanes after the provider rejected a call with a 429.
+
+        The request bucket is drained and admission is paused, so the rejected
+        call (retried by AdmittedLLM) and every queued call resume together once
+        the provider window has passed.
+        """
+        lane = Lane(lane)
+        with self._cond:
+            now = time.monotonic()
+            pause = retry_after if retry_after is not None else 60.0 / self.requests.capacity
+            self._paused_until = max(self._paused_until, now + pause)
+            self.requests.drain(now)
+            self._metrics[lane].rate_limited += 1
+            self._cond.notify_all()
+        logger.warning(f"Provider rate limited a {lane.value} call, pausing admission for {pause:.2f}s")
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Current bucket levels and per-lane queue metrics."""
+        with self._cond:
+            now = time.monotonic()
+            self.requests.refill(now)
+            self.tokens.refill(now)
+            return {
+                "requests_per_minute": self.requests.capacity,
+                "tokens_per_minute": self.tokens.capacity,
+                "available_requests": self.requests.tokens,
+                "available_tokens": self.tokens.tokens,
+                "paused_seconds": max(0.0, self._paused_until - now),
+                "lanes": {lane.value: self._metrics[lane].as_dict() for lane in Lane},
+            }
+
+
+def estimate_tokens(messages: Union[str, List[Dict[str, Any]]]) -> int:
+    """Estimate the prompt tokens of a chat completion request."""
+    if isinstance(messages, str):
+        text = messages
+    else:
+        text = "".join(str(message.get("content") or "") for message in messages)
+    # Every chat message also carries a few tokens of role/formatting overhead
+    overhead = 0 if isinstance(messages, str) else 4 * len(messages)
+    return len(text) // CHARS_PER_TOKEN + overhead + 1
+
+
+_controller: Optional[AdmissionController] = None
+_controller_lock = threading.Lock()
+
+
+def get_admission_controller() -> AdmissionController:
+    """Return the process-wide controller, configured from the environment.
+
+    LLM_REQUESTS_PER_MINUTE and LLM_TOKENS_PER_MINUTE should match the provider
+    quota shared by all crews.
+    """
+    global _controller
+    with _controller_lock:
+        if _controller is None:
+            _controller = AdmissionController(
+                requests_per_minute=float(os.getenv("LLM_REQUESTS_PER_MINUTE", "60")),
+                tokens_per_minute=float(os.getenv("LLM_TOKENS_PER_MINUTE", "90000")),
+            )
+        return _controller
+
+
+def set_admission_controller(controller: Optional[AdmissionController]) -> None:
+    """Replace the process-wide controller (None re-reads the environment on next use)."""
+    global _controller
+    with _controller_lock:
+        _controller = controller
+
+
+def _is_rate_limit_error(error: Exception) -> bool:
+    return type(error).__name__ == "RateLimitError" or getattr(error, "status_code", None) == 429
+
+
+def _retry_after(error: Exception) -> Optional[float]:
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None) or {}
+    try:
+        return float(headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
+
+class AdmittedLLM(LLM):
+    """crewAI LLM whose calls go through the global admission controller."""
+
+    def __init__(self, lane: Lane = Lane.BATCH, model: Optional[str] = None, **kwargs: Any):
+        model = model or os.getenv("MODEL") or os.getenv("OPENAI_MODEL_NAME") or "gpt-4o-mini"
+        super().__init__(model=model, **kwargs)
+        self.lane = Lane(lane)
+
+    def call(self, messages: Union[str, List[Dict[str, Any]]], *args: Any, **kwargs: Any) -> Any:
+        controller = get_admission_controller()
+        prompt_tokens = estimate_tokens(messages)
+        estimated = prompt_tokens + (getattr(self, "max_tokens", None) or DEFAULT_COMPLETION_TOKENS)
+        for attempt in range(RATE_LIMIT_RETRIES + 1):
+            controller.acquire(estimated, self.lane)
+            try:
+                response = super().call(messages, *args, **kwargs)
+                break
+            except Exception as e:
+                if not _is_rate_limit_error(e):
+                    raise
+                # The provider did not serve the call, so its tokens were not spent
+                controller.reconcile(estimated, 0)
+                controller.penalize(self.lane, _retry_after(e))
+                if attempt == RATE_LIMIT_RETRIES:
+                    raise
+                logger.info(f"Retrying rate limited {self.lane.value} call ({attempt + 1}/{RATE_LIMIT_RETRIES})")
+        completion_tokens = estimate_tokens(response) if isinstance(response, str) else 0
+        controller.reconcile(estimated, prompt_tokens + completion_tokens)
+        return response
@@ -0,0 +1,599 @@
+"""
+Progress Time-Series Store
+
+Each ProjectProgres run appends a typed snapshot of the Trello board metrics
+(cards per list, open/done/due/overdue counts, per-member activity and the
+list of every card) to a local append-only columnar store, so burndown,
+velocity and cycle time trends can be answered without re-crawling the board
+or asking the LLM again.
+
+Layout of the store directory:
+- keys.txt: interned keys (list ids and names, member usernames, card ids), one per line
+- raw.*: one binary column file per field of every recorded metric row
+- moves.*: a row each time a card shows up in a new list or leaves the board
+- completions.*: a row per member each time one of their cards enters a done list
+- names.*: a row each time a list shows up with a new name
+- daily.*: the last value of each series per day, folded in once the day is over
+- state.json: how many raw rows have already been folded into the daily columns
+
+Daily series, completion times per member and the time cards spent in each
+list are kept up to date incrementally as snapshots are appended, so range
+queries only do a couple of binary searches per series.
+"""
+
+import json
+import logging
+import os
+import threading
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import date, datetime, timedelta, timezone
+from enum import IntEnum
+from typing import Any, Dict, List, Optional, Tuple
+
+import requests
+from pydantic import BaseModel, Field
+
+logger = logging.getLogger(__name__)
+
+EPOCH = date(1970, 1, 1)
+SECONDS_PER_DAY = 86400
+# Longest date range a single query may cover
+MAX_RANGE_DAYS = 3 * 366
+BOARD_KEY = ""
+# List key of a move recording that the card left the board
+REMOVED_LIST = -1
+
+
+class Metric(IntEnum):
+    """Metric codes stored in the `metric` column"""
+    LIST_CARDS = 1
+    OPEN_CARDS = 2
+    DONE_CARDS = 3
+    DUE_CARDS = 4
+    OVERDUE_CARDS = 5
+    MEMBER_OPEN = 6
+    MEMBER_DONE = 7
+    MEMBER_ACTIONS = 8
+
+
+class BoardSnapshot(BaseModel):
+    """Model for the board metrics captured by a single progress run"""
+    taken_at: datetime = Field(..., description="When the snapshot was taken (UTC)")
+    list_names: Dict[str, str] = Field(default={}, description="Name of each list, by list id")
+    list_cards: Dict[str, int] = Field(default={}, description="Number of cards per list id")
+    open_cards: int = Field(..., description="Cards not in a done list")
+    done_cards: int = Field(..., description="Cards in a done list")
+    due_cards: int = Field(..., description="Open cards with a due date")
+    overdue_cards: int = Field(..., description="Open cards past their due date")
+    member_open: Dict[str, int] = Field(default={}, description="Open cards assigned per member")
+    member_done: Dict[str, int] = Field(default={}, description="Done cards assigned per member")
+    member_actions: Dict[str, int] = Field(default={}, description="Comments written per member")
+    card_lists: Dict[str, str] = Field(default={}, description="List id of each card, by card id")
+    card_members: Dict[str, List[str]] = Field(default={}, description="Usernames assigned to each card, by card id")
+    done_lists: List[str] = Field(default=[], description="Ids of the lists whose cards count as done")
+
+
+class BurndownPoint(BaseModel):
+    """Model for a single day of the burndown chart"""
+    date: str = Field(..., description="The day (YYYY-MM-DD)")
+    open_cards: int = Field(..., description="Cards remaining at the end of the day")
+    done_cards: int = Field(..., description="Cards done at the end of the day")
+    due_cards: int = Field(..., description="Open cards with a due date at the end of the day")
+    overdue_cards: int = Field(..., description="Overdue cards at the end of the day")
+
+
+class MemberVelocity(BaseModel):
+    """Model for the velocity of a team member over a date range"""
+    member: str = Field(..., description="The Trello username of the member")
+    completed: int = Field(..., description="Cards completed in the range")
+    per_window: float = Field(..., description="Average cards completed per window")
+    windows: List[int] = Field(default=[], description="Cards completed in each window of the range")
+
+
+class ListCycleTime(BaseModel):
+    """Model for the time cards spent in a list over a date range"""
+    list_id: str = Field(..., description="The Trello id of the list")
+    list_name: str = Field(..., description="The latest recorded name of the list")
+    cards: int = Field(..., description="Cards that left the list in the range")
+    average_days: float = Field(..., description="Average days those cards spent in the list")
+
+
+def _timestamp(moment: datetime) -> int:
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return int(moment.timestamp())
+
+
+def _date(day: int) -> str:
+    return (EPOCH + timedelta(days=day)).isoformat()
+
+
+def _parse_day(value: str) -> int:
+    return (date.fromisoformat(value) - EPOCH).days
+
+
+def _parse_range(start: str, end: str) -> Tuple[int, int]:
+    first, last = _parse_day(start), _parse_day(end)
+    if last < first:
+        raise ValueError(f"end ({end}) is before start ({start})")
+    if last - first + 1 > MAX_RANGE_DAYS:
+        raise ValueError(f"Date range is longer than {MAX_RANGE_DAYS} days")
+    return first, last
+
+
+class _Series:
+    """Daily values of one (metric, key) series"""
+
+    __slots__ = ("days", "values")
+
+    def __init__(self):
+        self.days = array("i")
+        self.values = array("q")
+
+    def set(self, day: int, value: int) -> None:
+        if self.days and self.days[-1] == day:
+            self.values.pop()
+            self.days.pop()
+        elif self.days and self.days[-1] > day:
+            raise ValueError(f"Snapshot for {_date(day)} is older than the last recorded day {_date(self.days[-1])}")
+        self.days.append(day)
+        self.values.append(value)
+
+    def _index(self, day: int) -> int:
+        return bisect_right(self.days, day) - 1
+
+    def value_at(self, day: int) -> int:
+        index = self._index(day)
+        return self.values[index] if index >= 0 else 0
+
+
+class _Stays:
+    """Finished stays of cards in one list, ordered by the time they left it.
+
+    `totals[i]` is the summed duration of the first i + 1 stays, so the stays
+    that ended in a range are a subtraction of two lookups.
+    """
+
+    __slots__ = ("exits", "totals")
+
+    def __init__(self):
+        self.exits = array("q")
+        self.totals = array("q")
+
+    def add(self, exited: int, seconds: int) -> None:
+        self.exits.append(exited)
+        self.totals.append((self.totals[-1] if self.totals else 0) + seconds)
+
+    def between(self, start: int, stop: int) -> Tuple[int, int]:
+        """Number and total seconds of the stays that ended in [start, stop)."""
+        low, high = bisect_left(self.exits, start), bisect_left(self.exits, stop)
+        total = (self.totals[high - 1] if high else 0) - (self.totals[low - 1] if low else 0)
+        return high - low, total
+
+
+class _ColumnSet:
+    """A group of append-only binary column files sharing a row count"""
+
+    def __init__(self, directory: str, prefix: str, columns: Tuple[Tuple[str, str], ...]):
+        self.paths = [os.path.join(directory, f"{prefix}.{name}") for name, _ in columns]
+        self.typecodes = [typecode for _, typecode in columns]
+
+    def __len__(self) -> int:
+        return min(
+            (os.path.getsize(path) if os.path.exists(path) else 0) // array(typecode).itemsize
+            for path, typecode in zip(self.paths, self.typecodes)
+        )
+
+    def repair(self) -> int:
+        """Truncate columns left uneven by an interrupted append. Returns the row count.
+
+        Only the writer may call this: a reader would cut off an append in progress.
+        """
+        rows = len(self)
+        for path, typecode in zip(self.paths, self.typecodes):
+            if os.path.exists(path) and os.path.getsize(path) > rows * array(typecode).itemsize:
+                with open(path, "r+b") as f:
+                    f.truncate(rows * array(typecode).itemsize)
+        return rows
+
+    def read(self, start: int, stop: int) -> List[array]:
+        columns = []
+        for path, typecode in zip(self.paths, self.typecodes):
+            column = array(typecode)
+            if stop > start:
+                with open(path, "rb") as f:
+                    f.seek(start * column.itemsize)
+                    column.fromfile(f, stop - start)
+            columns.append(column)
+        return columns
+
+    def append(self, columns: List[array]) -> None:
+        for path, column in zip(self.paths, columns):
+            with open(path, "ab") as f:
+                column.tofile(f)
+                f.flush()
+                os.fsync(f.fileno())
+
+
+RAW_COLUMNS = (("ts", "q"), ("metric", "B"), ("key", "i"), ("value", "q"))
+DAILY_COLUMNS = (("day", "i"), ("metric", "B"), ("key", "i"), ("value", "q"))
+MOVE_COLUMNS = (("ts", "q"), ("card", "i"), ("list", "i"), ("done", "B"))
+COMPLETION_COLUMNS = (("ts", "q"), ("member", "i"), ("card", "i"))
+NAME_COLUMNS = (("ts", "q"), ("list", "i"), ("name", "i"))
+
+
+class ProgressStore:
+    """Append-only columnar store of board snapshots with burndown, velocity and cycle time queries"""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self._keys_path = os.path.join(directory, "keys.txt")
+        self._state_path = os.path.join(directory, "state.json")
+        self._raw = _ColumnSet(directory, "raw", RAW_COLUMNS)
+        self._daily = _ColumnSet(directory, "daily", DAILY_COLUMNS)
+        self._moves = _ColumnSet(directory, "moves", MOVE_COLUMNS)
+        self._completions = _ColumnSet(directory, "completions", COMPLETION_COLUMNS)
+        self._names = _ColumnSet(directory, "names", NAME_COLUMNS)
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self) -> None:
+        self._keys: List[str] = []
+        if os.path.exists(self._keys_path):
+            with open(self._keys_path, "rb") as f:
+                data = f.read()
+            # A key without its newline is still being written
+            self._keys = data[:data.rfind(b"\n") + 1].decode("utf-8").split("\n")[:-1]
+        self._key_ids = {key: index for index, key in enumerate(self._keys)}
+        self._series: Dict[Tuple[int, int], _Series] = {}
+        self._first_ts: Optional[int] = None
+        self._last_ts: Optional[int] = None
+        # Current list, entry time and whether that list is done, of every card on the board, by card key
+        self._card_lists: Dict[int, Tuple[int, int, bool]] = {}
+        self._stays: Dict[int, _Stays] = {}
+        # Times the cards of each member entered a done list, by member key
+        self._completed: Dict[int, array] = {}
+        # Latest name key of every list, by list key
+        self._list_names: Dict[int, int] = {}
+        # Last values of the days not yet folded into the daily columns
+        self._pending: Dict[Tuple[int, int, int], int] = {}
+
+        flushed = 0
+        if os.path.exists(self._state_path):
+            with open(self._state_path, "r") as f:
+                flushed = json.load(f)["flushed_rows"]
+
+        # Readers never repair the columns; rows of an unfinished append are just not seen yet
+        self._raw_rows = len(self._raw)
+        if self._raw_rows:
+            self._first_ts = self._raw.read(0, 1)[0][0]
+            self._last_ts = self._raw.read(self._raw_rows - 1, self._raw_rows)[0][0]
+
+        days, metrics, keys, values = self._daily.read(0, len(self._daily))
+        for row in zip(days, metrics, keys, values):
+            self._apply(*row)
+
+        for ts, metric, key, value in zip(*self._raw.read(min(flushed, self._raw_rows), self._raw_rows)):
+            day = ts // SECONDS_PER_DAY
+            self._apply(day, metric, key, value)
+            self._pending[(day, metric, key)] = value
+        self._flushed_rows = flushed
+
+        self._move_rows = len(self._moves)
+        for ts, card, list_key, done in zip(*self._moves.read(0, self._move_rows)):
+            self._move(ts, card, list_key, bool(done))
+
+        self._completion_rows = len(self._completions)
+        for ts, member, _ in zip(*self._completions.read(0, self._completion_rows)):
+            self._complete(ts, member)
+
+        self._name_rows = len(self._names)
+        for _, list_key, name in zip(*self._names.read(0, self._name_rows)):
+            self._list_names[list_key] = name
+
+    def _apply(self, day: int, metric: int, key: int, value: int) -> None:
+        series = self._series.get((metric, key))
+        if series is None:
+            series = self._series[(metric, key)] = _Series()
+        series.set(day, value)
+
+    def _move(self, ts: int, card: int, list_key: int, done: bool) -> None:
+        current = self._card_lists.get(card)
+        # Cards already on the board at the first snapshot have no known entry time
+        if current is not None and current[1] != self._first_ts:
+            stays = self._stays.get(current[0])
+            if stays is None:
+                stays = self._stays[current[0]] = _Stays()
+            stays.add(ts, ts - current[1])
+        if list_key == REMOVED_LIST:
+            self._card_lists.pop(card, None)
+        else:
+            self._card_lists[card] = (list_key, ts, done)
+
+    def _complete(self, ts: int, member: int) -> None:
+        completed = self._completed.get(member)
+        if completed is None:
+            completed = self._completed[member] = array("q")
+        completed.append(ts)
+
+    def _refresh(self) -> None:
+        """Reload if another process has appended since the last load."""
+        if (len(self._raw) != self._raw_rows or len(self._moves) != self._move_rows
+                or len(self._completions) != self._completion_rows or len(self._names) != self._name_rows):
+            self._load()
+
+    def _repair(self) -> None:
+        """Drop whatever an interrupted append left behind, before writing."""
+        for columns in (self._raw, self._daily, self._moves, self._completions, self._names):
+            columns.repair()
+        keys_size = sum(len(key.encode("utf-8")) + 1 for key in self._keys)
+        if os.path.exists(self._keys_path) and os.path.getsize(self._keys_path) > keys_size:
+            with open(self._keys_path, "r+b") as f:
+                f.truncate(keys_size)
+
+    def _key_id(self, key: str) -> int:
+        key = key.replace("\n", " ")
+        if key not in self._key_ids:
+            with open(self._keys_path, "a", encoding="utf-8") as f:
+                f.write(key + "\n")
+            self._key_ids[key] = len(self._keys)
+            self._keys.append(key)
+        return self._key_ids[key]
+
+    def _flush(self, before_day: int) -> None:
+        """Fold the pending values of days before `before_day` into the daily columns."""
+        if not self._pending or max(day for day, _, _ in self._pending) >= before_day:
+            return
+        rows = sorted(self._pending.items())
+        self._daily.append([
+            array("i", [day for (day, _, _), _ in rows]),
+            array("B", [metric for (_, metric, _), _ in rows]),
+            array("i", [key for (_, _, key), _ in rows]),
+            array("q", [value for _, value in rows]),
+        ])
+        temp_path = self._state_path + ".tmp"
+        with open(temp_path, "w") as f:
+            json.dump({"flushed_rows": self._raw_rows}, f)
+        os.replace(temp_path, self._state_path)
+        self._flushed_rows = self._raw_rows
+        self._pending = {}
+
+    def append(self, snapshot: BoardSnapshot) -> None:
+        """Append a snapshot. Snapshots must be appended in chronological order."""
+        with self._lock:
+            self._refresh()
+            self._repair()
+            ts = _timestamp(snapshot.taken_at)
+            day = ts // SECONDS_PER_DAY
+            if self._last_ts is not None and ts < self._last_ts:
+                raise ValueError(
+                    f"Snapshot taken at {snapshot.taken_at.isoformat()} is older than the last recorded one "
+                    f"({datetime.fromtimestamp(self._last_ts, timezone.utc).isoformat()})"
+                )
+            if self._first_ts is None:
+                self._first_ts = ts
+
+            renamed = []
+            for list_id, name in snapshot.list_names.items():
+                list_key, name_key = self._key_id(list_id), self._key_id(name)
+                if self._list_names.get(list_key) != name_key:
+                    renamed.append((list_key, name_key))
+            if renamed:
+                self._names.append([
+                    array("q", [ts] * len(renamed)),
+                    array("i", [list_key for list_key, _ in renamed]),
+                    array("i", [name_key for _, name_key in renamed]),
+                ])
+                self._name_rows += len(renamed)
+                self._list_names.update(renamed)
+
+            rows: Dict[Tuple[int, int], int] = {
+                (Metric.OPEN_CARDS, self._key_id(BOARD_KEY)): snapshot.open_cards,
+                (Metric.DONE_CARDS, self._key_id(BOARD_KEY)): snapshot.done_cards,
+                (Metric.DUE_CARDS, self._key_id(BOARD_KEY)): snapshot.due_cards,
+                (Metric.OVERDUE_CARDS, self._key_id(BOARD_KEY)): snapshot.overdue_cards,
+            }
+            for metric, counts in (
+                (Metric.LIST_CARDS, snapshot.list_cards),
+                (Metric.MEMBER_OPEN, snapshot.member_open),
+                (Metric.MEMBER_DONE, snapshot.member_done),
+                (Metric.MEMBER_ACTIONS, snapshot.member_actions),
+            ):
+                for key, count in counts.items():
+                    rows[(metric, self._key_id(key))] = count
+            # Lists and members missing from this snapshot drop to zero
+            for (metric, key), series in self._series.items():
+                if (metric, key) not in rows and series.values[-1] != 0:
+                    rows[(metric, key)] = 0
+
+            self._flush(day)
+            ordered = sorted(rows.items())
+            self._raw.append([
+                array("q", [ts] * len(ordered)),
+                array("B", [metric for (metric, _), _ in ordered]),
+                array("i", [key for (_, key), _ in ordered]),
+                array("q", [value for _, value in ordered]),
+            ])
+            self._raw_rows += len(ordered)
+            self._last_ts = ts
+            for (metric, key), value in ordered:
+                self._apply(day, metric, key, value)
+                self._pending[(day, metric, key)] = value
+
+            done_lists = {self._key_id(list_id) for list_id in snapshot.done_lists}
+            moves, completions = [], []
+            for card_id, list_id in snapshot.card_lists.items():
+                card, list_key = self._key_id(card_id), self._key_id(list_id)
+                current = self._card_lists.get(card)
+                if current is None or current[0] != list_key:
+                    done = list_key in done_lists
+                    moves.append((card, list_key, done))
+                    # Cards already done at the first snapshot were completed before the store existed
+                    was_done = current[2] if current is not None else ts == self._first_ts
+                    if done and not was_done:
+                        completions += [(self._key_id(member), card) for member in snapshot.card_members.get(card_id, [])]
+            cards_on_board = {self._key_ids[card_id] for card_id in snapshot.card_lists}
+            moves += [(card, REMOVED_LIST, False) for card in self._card_lists if card not in cards_on_board]
+            if moves:
+                self._moves.append([
+                    array("q", [ts] * len(moves)),
+                    array("i", [card for card, _, _ in moves]),
+                    array("i", [list_key for _, list_key, _ in moves]),
+                    array("B", [done for _, _, done in moves]),
+                ])
+                self._move_rows += len(moves)
+                for card, list_key, done in moves:
+                    self._move(ts, card, list_key, done)
+            if completions:
+                self._completions.append([
+                    array("q", [ts] * len(completions)),
+                    array("i", [member for member, _ in completions]),
+                    array("i", [card for _, card in completions]),
+                ])
+                self._completion_rows += len(completions)
+                for member, _ in completions:
+                    self._complete(ts, member)
+
+    def _board_series(self, metric: Metric) -> _Series:
+        return self._series.get((metric, self._key_ids.get(BOARD_KEY, -1)), _Series())
+
+    def burndown(self, start: str, end: str) -> List[BurndownPoint]:
+        """Open, done, due and overdue cards at the end of each day between start and end (inclusive)."""
+        with self._lock:
+            self._refresh()
+            first, last = _parse_range(start, end)
+            open_cards = self._board_series(Metric.OPEN_CARDS)
+            done_cards = self._board_series(Metric.DONE_CARDS)
+            due_cards = self._board_series(Metric.DUE_CARDS)
+            overdue_cards = self._board_series(Metric.OVERDUE_CARDS)
+            return [
+                BurndownPoint(
+                    date=_date(day),
+                    open_cards=open_cards.value_at(day),
+                    done_cards=done_cards.value_at(day),
+                    due_cards=due_cards.value_at(day),
+                    overdue_cards=overdue_cards.value_at(day),
+                )
+                for day in range(first, last + 1)
+            ]
+
+    def velocity(self, start: str, end: str, window_days: int = 7) -> List[MemberVelocity]:
+        """Cards each member completed between start and end, split into windows of `window_days`.
+
+        A card is completed when it enters a done list, and counts for every member assigned to it then.
+        """
+        if window_days < 1:
+            raise ValueError("window_days must be at least 1")
+        with self._lock:
+            self._refresh()
+            first, last = _parse_range(start, end)
+            boundaries = [day * SECONDS_PER_DAY for day in range(first, last + 1, window_days)]
+            boundaries.append((last + 1) * SECONDS_PER_DAY)
+            velocities = []
+            for member, completed in self._completed.items():
+                totals = [bisect_left(completed, ts) for ts in boundaries]
+                windows = [after - before for before, after in zip(totals, totals[1:])]
+                velocities.append(MemberVelocity(
+                    member=self._keys[member],
+                    completed=totals[-1] - totals[0],
+                    per_window=(totals[-1] - totals[0]) / len(windows) if windows else 0.0,
+                    windows=windows,
+                ))
+            return sorted(velocities, key=lambda velocity: velocity.member)
+
+    def cycle_time(self, start: str, end: str) -> List[ListCycleTime]:
+        """Average time cards spent in each list, over the stays that ended between start and end."""
+        with self._lock:
+            self._refresh()
+            first, last = _parse_range(start, end)
+            cycle_times = []
+            for list_key, stays in self._stays.items():
+                cards, seconds = stays.between(first * SECONDS_PER_DAY, (last + 1) * SECONDS_PER_DAY)
+                if cards:
+                    cycle_times.append(ListCycleTime(
+                        list_id=self._keys[list_key],
+                        list_name=self._keys[self._list_names.get(list_key, list_key)],
+                        cards=cards,
+                        average_days=seconds / cards / SECONDS_PER_DAY,
+                    ))
+            return sorted(cycle_times, key=lambda cycle_time: (cycle_time.list_name, cycle_time.list_id))
+
+
+def build_snapshot(cards: List[Dict[str, Any]], lists: List[Dict[str, Any]], members: List[Dict[str, Any]],
+                   taken_at: Optional[datetime] = None, done_lists: Optional[List[str]] = None) -> BoardSnapshot:
+    """Build a snapshot from the Trello cards, lists and members of a board."""
+    taken_at = taken_at or datetime.now(timezone.utc)
+    done_lists = [name.strip().lower() for name in (done_lists or os.getenv("TRELLO_DONE_LISTS", "Done").split(","))]
+    list_names = {trello_list["id"]: trello_list["name"] for trello_list in lists}
+    usernames = {member["id"]: member.get("username") or member["id"] for member in members}
+
+    snapshot = BoardSnapshot(
+        taken_at=taken_at, list_names=list_names, open_cards=0, done_cards=0, due_cards=0, overdue_cards=0,
+        done_lists=[list_id for list_id, name in list_names.items() if name.lower() in done_lists],
+    )
+    for card in cards:
+        list_id = card.get("idList") or ""
+        snapshot.list_cards[list_id] = snapshot.list_cards.get(list_id, 0) + 1
+        card_members = [usernames.get(member_id, member_id) for member_id in card.get("idMembers") or []]
+        if card.get("id"):
+            snapshot.card_lists[card["id"]] = list_id
+            snapshot.card_members[card["id"]] = card_members
+        done = list_id in snapshot.done_lists
+        assigned = snapshot.member_done if done else snapshot.member_open
+        for username in card_members:
+            assigned[username] = assigned.get(username, 0) + 1
+        for action in card.get("actions") or []:
+            username = usernames.get(action.get("idMemberCreator"), action.get("idMemberCreator"))
+            if username:
+                snapshot.member_actions[username] = snapshot.member_actions.get(username, 0) + 1
+
+        if done:
+            snapshot.done_cards += 1
+            continue
+        snapshot.open_cards += 1
+        if card.get("due"):
+            snapshot.due_cards += 1
+            due = datetime.fromisoformat(card["due"].replace("Z", "+00:00"))
+            if due < taken_at and not card.get("dueComplete"):
+                snapshot.overdue_cards += 1
+    return snapshot
+
+
+def fetch_board_snapshot() -> BoardSnapshot:
+    """Fetch the configured Trello board and build a snapshot of its metrics."""
+    base_url = f"{os.getenv('DLAI_TRELLO_BASE_URL', 'https://api.trello.com')}/1/boards/{os.environ['TRELLO_BOARD_ID']}"
+    auth = {'key': os.environ['TRELLO_API_KEY'], 'token': os.environ['TRELLO_API_TOKEN']}
+
+    def get(path: str, **query: str) -> List[Dict[str, Any]]:
+        response = requests.get(f"{base_url}/{path}", params={**auth, **query}, timeout=30)
+        response.raise_for_status()
+        return response.json()
+
+    return build_snapshot(
+        cards=get("cards", fields="name,idList,idMembers,due,dueComplete", actions="commentCard"),
+        lists=get("lists", fields="name"),
+        members=get("members", fields="username"),
+    )
+
+
+_store: Optional[ProgressStore] = None
+_store_lock = threading.Lock()
+
+
+def get_progress_store() -> ProgressStore:
+    """Return the store in PROGRESS_STORE_DIR (default: ./progress_store)."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = ProgressStore(os.getenv("PROGRESS_STORE_DIR", "progress_store"))
+        return _store
+
+
+def record_board_snapshot() -> BoardSnapshot:
+    """Fetch the board and append its snapshot to the progress store."""
+    snapshot = fetch_board_snapshot()
+    get_progress_store().append(snapshot)
+    logger.info(f"Recorded progress snapshot: {snapshot.open_cards} open, {snapshot.done_cards} done")
+    return snapshot
@@ -0,0 +1,20 @@
+import importlib
+import importlib.machinery
+import importlib.util
+import os
+import sys
+
+import pytest
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture
+def backend(monkeypatch):
+    """The FastAPI backend, imported as a package the way uvicorn loads it."""
+    for name in ("TRELLO_API_KEY", "TRELLO_API_TOKEN", "TRELLO_BOARD_ID"):
+        monkeypatch.setenv(name, "test")
+    spec = importlib.machinery.ModuleSpec("planforge_root", None, is_package=True)
+    spec.submodule_search_locations = [REPO_ROOT]
+    monkeypatch.setitem(sys.modules, "planforge_root", importlib.util.module_from_spec(spec))
+    return importlib.import_module("planforge_root.backend")
@@ -0,0 +1,287 @@
+"""
+Tests for the global LLM admission controller, run against a local fake
+provider that enforces request and token quotas and answers 429 when over them.
+"""
+
+import importlib
+import os
+import subprocess
+import sys
+import threading
+import time
+
+import pytest
+from crewai import LLM
+
+import llm_admission
+from llm_admission import (
+    AdmissionController,
+    AdmittedLLM,
+    Lane,
+    RATE_LIMIT_RETRIES,
+    estimate_tokens,
+    get_admission_controller,
+    set_admission_controller,
+)
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class RateLimitError(Exception):
+    """Mimics the 429 error raised by the provider client"""
+    status_code = 429
+
+    def __init__(self, retry_after=None):
+        super().__init__("429 Too Many Requests")
+        self.response = type("Response", (), {"headers": {"retry-after": retry_after}})()
+
+
+class FakeProvider:
+    """Provider enforcing per-minute request and token quotas with refilling buckets.
+
+    Like real providers it reserves prompt + max_tokens when a call arrives and
+    settles to the tokens actually used once the completion is generated.
+    """
+
+    def __init__(self, requests_per_minute, tokens_per_minute):
+        self.lock = threading.Lock()
+        self.limits = {"requests": requests_per_minute, "tokens": tokens_per_minute}
+        self.available = dict(self.limits)
+        self.updated = time.monotonic()
+        self.accepted = []
+        self.rejected = 0
+        # Retry-After values of the next calls to reject with a 429
+        self.rejections = []
+
+    def _refill(self):
+        now = time.monotonic()
+        for name, limit in self.limits.items():
+            self.available[name] = min(limit, self.available[name] + (now - self.updated) * limit / 60.0)
+        self.updated = now
+
+    def drain(self):
+        with self.lock:
+            self._refill()
+            self.available = {name: 0.0 for name in self.limits}
+
+    def complete(self, messages, max_tokens):
+        prompt_tokens = estimate_tokens(messages)
+        reserved = prompt_tokens + (max_tokens or llm_admission.DEFAULT_COMPLETION_TOKENS)
+        with self.lock:
+            self._refill()
+            if self.rejections:
+                retry_after = self.rejections.pop(0)
+                self.rejected += 1
+                raise RateLimitError(retry_after)
+            # Small tolerance for clock skew between the provider and the controller
+            if self.available["requests"] < 1 - 1e-3 or self.available["tokens"] < reserved - 1e-3:
+                self.rejected += 1
+                raise RateLimitError()
+            self.available["requests"] -= 1
+            self.available["tokens"] -= reserved
+            self.accepted.append(messages[0]["content"].strip())
+            response = "ok"
+            self.available["tokens"] += reserved - (prompt_tokens + estimate_tokens(response))
+            return response
+
+
+@pytest.fixture
+def provider(monkeypatch):
+    fake = FakeProvider(requests_per_minute=600, tokens_per_minute=10 ** 9)
+
+    def call(self, messages, *args, **kwargs):
+        return fake.complete(messages, self.max_tokens)
+
+    monkeypatch.setattr(LLM, "call", call)
+    return fake
+
+
+def use_controller(provider, requests_per_minute, tokens_per_minute):
+    """Install a controller with the provider's quota, both starting from empty buckets."""
+    provider.limits = {"requests": requests_per_minute, "tokens": tokens_per_minute}
+    controller = AdmissionController(requests_per_minute, tokens_per_minute)
+    # Drain the provider first so it never has less capacity than the controller
+    provider.drain()
+    now = time.monotonic()
+    controller.requests.drain(now)
+    controller.tokens.drain(now)
+    set_admission_controller(controller)
+    return controller
+
+
+@pytest.fixture(autouse=True)
+def reset_controller():
+    yield
+    set_admission_controller(None)
+
+
+def run_calls(labels, lane, max_tokens=1, content_size=0):
+    llm = AdmittedLLM(lane=lane, model="gpt-4o-mini", max_tokens=max_tokens)
+    errors = []
+
+    def call(label):
+        try:
+            llm.call([{"role": "user", "content": label.ljust(content_size)}])
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=call, args=(label,)) for label in labels]
+    for thread in threads:
+        thread.start()
+    return threads, errors
+
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "condition not reached in time"
+        time.sleep(0.005)
+
+
+def test_requests_per_minute_limit_is_respected(provider):
+    use_controller(provider, requests_per_minute=600, tokens_per_minute=10 ** 9)
+    start = time.monotonic()
+    threads, errors = run_calls([f"batch-{i}" for i in range(10)], Lane.BATCH)
+    for thread in threads:
+        thread.join()
+
+    # 600 RPM refills one request every 0.1s
+    assert time.monotonic() - start >= 0.9
+    assert errors == []
+    assert provider.rejected == 0
+    assert len(provider.accepted) == 10
+
+
+def test_tokens_per_minute_limit_is_respected(provider):
+    use_controller(provider, requests_per_minute=10 ** 6, tokens_per_minute=60000)
+    start = time.monotonic()
+    # Each call costs about 105 tokens against a refill of 1000 tokens per second
+    threads, errors = run_calls([f"batch-{i}" for i in range(10)], Lane.BATCH, content_size=400)
+    for thread in threads:
+        thread.join()
+
+    assert time.monotonic() - start >= 0.9
+    assert errors == []
+    assert provider.rejected == 0
+    assert len(provider.accepted) == 10
+
+
+def test_interactive_calls_are_admitted_before_queued_batch_calls(provider):
+    controller = use_controller(provider, requests_per_minute=600, tokens_per_minute=10 ** 9)
+    batch, batch_errors = run_calls([f"batch-{i}" for i in range(8)], Lane.BATCH)
+    wait_for(lambda: controller.snapshot()["lanes"]["batch"]["waiting"] == 8)
+    admitted_before = len(provider.accepted)
+
+    interactive, interactive_errors = run_calls([f"interactive-{i}" for i in range(3)], Lane.INTERACTIVE)
+    for thread in batch + interactive:
+        thread.join()
+
+    assert batch_errors == interactive_errors == []
+    order = provider.accepted
+    interactive_positions = [index for index, label in enumerate(order) if label.startswith("interactive")]
+    # At most the batch call already at the head of its lane may slip in first
+    assert max(interactive_positions) < admitted_before + 4
+    assert order[-1].startswith("batch")
+
+
+def test_rate_limited_call_is_retried_after_the_pause(provider):
+    controller = use_controller(provider, requests_per_minute=6000, tokens_per_minute=10 ** 9)
+    controller.requests.refund(6000)
+    provider.rejections = ["0.2"]
+
+    llm = AdmittedLLM(lane=Lane.INTERACTIVE, model="gpt-4o-mini", max_tokens=1)
+    start = time.monotonic()
+    assert llm.call([{"role": "user", "content": "interactive"}]) == "ok"
+
+    assert time.monotonic() - start >= 0.15
+    assert provider.rejected == 1
+    assert provider.accepted == ["interactive"]
+    assert controller.snapshot()["lanes"]["interactive"]["rate_limited"] == 1
+
+
+def test_rate_limit_error_is_raised_once_retries_are_used_up(provider):
+    controller = use_controller(provider, requests_per_minute=6000, tokens_per_minute=10 ** 9)
+    controller.requests.refund(6000)
+    provider.rejections = ["0.01"] * (RATE_LIMIT_RETRIES + 1)
+
+    llm = AdmittedLLM(lane=Lane.BATCH, model="gpt-4o-mini", max_tokens=1)
+    with pytest.raises(RateLimitError):
+        llm.call([{"role": "user", "content": "batch"}])
+
+    assert provider.rejected == RATE_LIMIT_RETRIES + 1
+    assert provider.accepted == []
+
+
+def test_rate_limit_response_pauses_every_lane(provider):
+    controller = use_controller(provider, requests_per_minute=6000, tokens_per_minute=10 ** 9)
+    controller.requests.refund(6000)
+    provider.rejections = ["0.5"]
+
+    rate_limited, errors = run_calls(["batch"], Lane.BATCH)
+    wait_for(lambda: controller.snapshot()["lanes"]["batch"]["rate_limited"] == 1)
+
+    queued = {}
+
+    def acquire(lane):
+        queued[lane] = controller.acquire(1, lane)
+
+    threads = [threading.Thread(target=acquire, args=(lane,)) for lane in Lane]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    for thread in rate_limited:
+        thread.join()
+
+    assert queued[Lane.INTERACTIVE] >= 0.3
+    assert queued[Lane.BATCH] >= 0.3
+    # The rejected call itself went through once admission resumed
+    assert errors == []
+    assert provider.accepted == ["batch"]
+
+
+def test_queue_time_metrics_are_recorded(provider):
+    controller = use_controller(provider, requests_per_minute=600, tokens_per_minute=10 ** 9)
+    threads, _ = run_calls(["interactive-0", "interactive-1"], Lane.INTERACTIVE)
+    for thread in threads:
+        thread.join()
+    threads, _ = run_calls(["batch-0"], Lane.BATCH)
+    for thread in threads:
+        thread.join()
+
+    lanes = controller.snapshot()["lanes"]
+    assert lanes["interactive"]["admitted"] == 2
+    assert lanes["batch"]["admitted"] == 1
+    for lane in lanes.values():
+        assert lane["waiting"] == 0
+        assert lane["avg_queue_seconds"] > 0
+        assert lane["max_queue_seconds"] >= lane["avg_queue_seconds"]
+        assert lane["estimated_tokens"] > 0
+
+
+def test_backend_and_both_crews_share_one_controller(backend):
+    planner_crew = importlib.import_module("planforge_root.src.project_planner.crew")
+    progress_crew = importlib.import_module("planforge_root.src.project_progres.crew")
+
+    assert planner_crew.AdmittedLLM is llm_admission.AdmittedLLM
+    assert progress_crew.AdmittedLLM is llm_admission.AdmittedLLM
+    assert backend.get_admission_controller() is get_admission_controller()
+
+    get_admission_controller().acquire(1, Lane.INTERACTIVE)
+    assert backend.get_admission_controller().snapshot()["lanes"]["interactive"]["admitted"] == 1
+
+
+def test_standalone_progress_crew_imports_without_the_planner_package():
+    """main.py runs the progress crew with only its own directory on the path."""
+    env = dict(os.environ, TRELLO_API_KEY="test", TRELLO_API_TOKEN="test", TRELLO_BOARD_ID="test")
+    env.pop("PYTHONPATH", None)
+    script = "import sys, crew; assert 'project_planner' not in sys.modules"
+    result = subprocess.run(
+        [sys.executable, "-c", script],
+        cwd=os.path.join(REPO_ROOT, "src", "project_progres"),
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    assert result.returncode == 0, result.stderr
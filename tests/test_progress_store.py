@@ -0,0 +1,288 @@
+"""
+Tests for the progress time-series store
+"""
+
+import importlib
+import json
+import os
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+import progress_store
+from progress_store import BoardSnapshot, ProgressStore, build_snapshot
+
+START = datetime(2026, 1, 1, 12, tzinfo=timezone.utc)
+
+
+def snapshot(day, hour=12, open_cards=0, done_cards=0, due_cards=0, overdue_cards=0, **counts):
+    return BoardSnapshot(
+        taken_at=START + timedelta(days=day, hours=hour - 12),
+        open_cards=open_cards,
+        done_cards=done_cards,
+        due_cards=due_cards,
+        overdue_cards=overdue_cards,
+        **counts,
+    )
+
+
+def board(day, hour=12, done=(), todo=(), members=("alice",), **counts):
+    """Snapshot of a board whose cards sit either in the "todo" or in the "done" list."""
+    card_lists = {**{card: "todo" for card in todo}, **{card: "done" for card in done}}
+    return snapshot(
+        day, hour,
+        card_lists=card_lists,
+        card_members={card: list(members) for card in card_lists},
+        done_lists=["done"],
+        **counts,
+    )
+
+
+def cycle_times(store, start, end):
+    return {cycle_time.list_id: (cycle_time.cards, cycle_time.average_days) for cycle_time in store.cycle_time(start, end)}
+
+
+def completed(store, start, end, window_days=7):
+    return {velocity.member: velocity.completed for velocity in store.velocity(start, end, window_days)}
+
+
+def queries(store):
+    return (
+        store.burndown("2026-01-01", "2026-01-10"),
+        store.velocity("2026-01-01", "2026-01-10", 2),
+        store.cycle_time("2026-01-01", "2026-01-10"),
+    )
+
+
+def test_results_survive_reopening_the_store(tmp_path):
+    store = ProgressStore(str(tmp_path))
+    for day in range(6):
+        for hour in (9, 17):
+            store.append(snapshot(
+                day, hour,
+                open_cards=20 - day * 2 - hour // 17,
+                done_cards=day * 2 + hour // 17,
+                overdue_cards=day % 3,
+                list_cards={"Todo": 20 - day, "Done": day},
+                card_lists={"a": "Todo" if day < 2 else "Done", "b": "Todo" if day < 4 else "Doing"},
+                card_members={"a": ["alice"], "b": ["bob"]},
+                done_lists=["Done"],
+            ))
+    expected = queries(store)
+
+    # Earlier days were folded into the daily columns, the last day is still pending
+    with open(os.path.join(tmp_path, "state.json")) as f:
+        flushed_rows = json.load(f)["flushed_rows"]
+    assert 0 < flushed_rows < store._raw_rows
+    assert len(store._daily) > 0
+
+    assert queries(ProgressStore(str(tmp_path))) == expected
+    burndown = expected[0]
+    assert [point.open_cards for point in burndown[:6]] == [19, 17, 15, 13, 11, 9]
+    assert burndown[9].open_cards == 9
+    assert completed(ProgressStore(str(tmp_path)), "2026-01-01", "2026-01-10") == {"alice": 1}
+
+
+def test_same_day_snapshots_keep_the_last_value(tmp_path):
+    store = ProgressStore(str(tmp_path))
+    store.append(board(0, 9, todo="abc", open_cards=10))
+    store.append(board(1, 9, done="a", todo="bc", open_cards=10))
+    store.append(board(1, 17, done="abc", open_cards=8))
+
+    def check(store):
+        assert [point.open_cards for point in store.burndown("2026-01-01", "2026-01-02")] == [10, 8]
+        assert completed(store, "2026-01-01", "2026-01-02") == {"alice": 3}
+
+    check(store)
+    check(ProgressStore(str(tmp_path)))
+    # Folding day 2 into the daily columns keeps only its last snapshot
+    store.append(board(2, done="abc", open_cards=7))
+    check(ProgressStore(str(tmp_path)))
+
+
+def test_out_of_order_snapshots_are_rejected(tmp_path):
+    store = ProgressStore(str(tmp_path))
+    store.append(snapshot(0, open_cards=5))
+    store.append(snapshot(2, open_cards=3))
+
+    with pytest.raises(ValueError):
+        store.append(snapshot(1, open_cards=4))
+
+    assert [point.open_cards for point in ProgressStore(str(tmp_path)).burndown("2026-01-01", "2026-01-03")] == [5, 5, 3]
+
+
+def test_earlier_snapshot_on_the_same_day_is_rejected(tmp_path):
+    store = ProgressStore(str(tmp_path))
+    store.append(snapshot(0, 20, open_cards=5, card_lists={"a": "Todo"}))
+
+    with pytest.raises(ValueError):
+        store.append(snapshot(0, 2, open_cards=4, card_lists={"a": "Doing"}))
+    with pytest.raises(ValueError):
+        ProgressStore(str(tmp_path)).append(snapshot(0, 2, open_cards=4, card_lists={"a": "Doing"}))
+
+    store.append(snapshot(1, open_cards=3, card_lists={"a": "Done"}))
+    reopened = ProgressStore(str(tmp_path))
+    assert [point.open_cards for point in reopened.burndown("2026-01-01", "2026-01-02")] == [5, 3]
+    assert cycle_times(reopened, "2026-01-01", "2026-01-02") == {}
+
+
+def test_burndown_reports_every_board_count(tmp_path):
+    store = ProgressStore(str(tmp_path))
+    store.append(snapshot(0, open_cards=6, done_cards=1, due_cards=4, overdue_cards=1))
+    store.append(snapshot(2, open_cards=5, done_cards=2, due_cards=3, overdue_cards=2))
+
+    counts = [
+        (point.date, point.open_cards, point.done_cards, point.due_cards, point.overdue_cards)
+        for point in ProgressStore(str(tmp_path)).burndown("2026-01-01", "2026-01-03")
+    ]
+    assert counts == [
+        ("2026-01-01", 6, 1, 4, 1),
+        ("2026-01-02", 6, 1, 4, 1),
+        ("2026-01-03", 5, 2, 3, 2),
+    ]
+
+
+def test_velocity_window_boundaries(tmp_path):
+    store = ProgressStore(str(tmp_path))
+    # Day on which each card enters the done list
+    done_days = {"a": 1, "b": 2, "c": 2, "d": 4, "e": 4, "f": 4, "g": 6}
+    for day in (0, 1, 2, 3, 4, 6):
+        store.append(board(
+            day,
+            done=[card for card, done_day in done_days.items() if done_day <= day],
+            todo=[card for card, done_day in done_days.items() if done_day > day],
+        ))
+
+    def windows(start, end, window_days):
+        [velocity] = store.velocity(start, end, window_days)
+        return velocity.windows, velocity.completed, velocity.per_window
+
+    # The last window is cut short at the end of the range
+    assert windows("2026-01-01", "2026-01-07", 3) == ([3, 3, 1], 7, 7 / 3)
+    assert windows("2026-01-01", "2026-01-06", 3) == ([3, 3], 6, 3.0)
+    assert windows("2026-01-03", "2026-01-05", 1) == ([2, 0, 3], 5, 5 / 3)
+    assert windows("2026-01-06", "2026-01-06", 7) == ([0], 0, 0.0)
+    with pytest.raises(ValueError):
+        store.velocity("2026-01-01", "2026-01-07", 0)
+
+def test_velocity_counts_cards_entering_a_done_list(tmp_path):
+    store = ProgressStore(str(tmp_path))
+    # a and b were done before the store existed
+    store.append(board(0, done="ab", todo="cd"))
+    store.append(board(1, done="abc", todo="d"))
+    # c is archived on the same day d is done
+    store.append(board(2, done="abd"))
+    # e is created straight in the done list, f is assigned to two members
+    store.append(board(3, done="abde"))
+    store.append(board(4, done="abde", todo="f", members=("alice", "bob")))
+    store.append(board(5, done="abdef", members=("alice", "bob")))
+
+    expected = {"alice": 4, "bob": 1}
+    assert completed(store, "2026-01-01", "2026-01-06") == expected
+    assert completed(ProgressStore(str(tmp_path)), "2026-01-01", "2026-01-06") == expected
+    [alice, _] = store.velocity("2026-01-01", "2026-01-06", 1)
+    assert alice.windows == [0, 1, 1, 1, 0, 1]
+
+
+def test_reader_never_truncates_an_unfinished_append(tmp_path):
+    store = ProgressStore(str(tmp_path))
+    store.append(snapshot(0, open_cards=5, card_lists={"a": "Todo"}))
+    # Simulate an append caught halfway: one raw column and a key without its newline
+    with open(os.path.join(tmp_path, "raw.ts"), "ab") as f:
+        f.write(b"\0" * 8)
+    with open(os.path.join(tmp_path, "keys.txt"), "ab") as f:
+        f.write(b"half")
+    sizes = {name: os.path.getsize(os.path.join(tmp_path, name)) for name in os.listdir(tmp_path)}
+
+    reader = ProgressStore(str(tmp_path))
+    assert [point.open_cards for point in reader.burndown("2026-01-01", "2026-01-01")] == [5]
+    assert {name: os.path.getsize(os.path.join(tmp_path, name)) for name in os.listdir(tmp_path)} == sizes
+
+    # The writer drops the leftovers before appending
+    reader.append(snapshot(1, open_cards=4, card_lists={"a": "Doing"}))
+    reopened = ProgressStore(str(tmp_path))
+    assert [point.open_cards for point in reopened.burndown("2026-01-01", "2026-01-02")] == [5, 4]
+    assert "half" not in reopened._keys
+    assert cycle_times(reopened, "2026-01-01", "2026-01-02") == {}
+
+
+def test_backend_and_progress_crew_share_one_store(backend, monkeypatch, tmp_path):
+    monkeypatch.setenv("PROGRESS_STORE_DIR", str(tmp_path))
+    monkeypatch.setattr(progress_store, "_store", None)
+    progress_crew = importlib.import_module("planforge_root.src.project_progres.crew")
+
+    assert backend.get_progress_store is progress_store.get_progress_store
+    assert progress_crew.record_board_snapshot is progress_store.record_board_snapshot
+    assert backend.get_progress_store() is progress_store.get_progress_store()
+
+
+@pytest.mark.parametrize("start, end", [
+    ("2026-01-05", "2026-01-01"),
+    ("0001-01-01", "9999-12-31"),
+    ("2026-01-01", "not-a-date"),
+])
+def test_invalid_date_ranges_are_rejected(tmp_path, start, end):
+    store = ProgressStore(str(tmp_path))
+    store.append(snapshot(0, open_cards=1))
+
+    with pytest.raises(ValueError):
+        store.burndown(start, end)
+    with pytest.raises(ValueError):
+        store.velocity(start, end)
+
+
+def test_cycle_time_per_list(tmp_path):
+    store = ProgressStore(str(tmp_path))
+    store.append(snapshot(0, card_lists={"a": "Todo", "b": "Todo"}))
+    store.append(snapshot(1, card_lists={"a": "Doing", "b": "Todo", "c": "Todo"}))
+    store.append(snapshot(3, card_lists={"a": "Done", "b": "Todo", "c": "Doing"}))
+    # c is archived
+    store.append(snapshot(4, card_lists={"a": "Done", "b": "Todo"}))
+
+    # a's time in Todo is unknown because it was already there at the first snapshot
+    expected = {"Todo": (1, 2.0), "Doing": (2, 1.5)}
+    assert cycle_times(store, "2026-01-01", "2026-01-31") == expected
+    assert cycle_times(ProgressStore(str(tmp_path)), "2026-01-01", "2026-01-31") == expected
+    assert cycle_times(store, "2026-01-04", "2026-01-04") == {"Todo": (1, 2.0), "Doing": (1, 2.0)}
+    assert cycle_times(store, "2026-01-06", "2026-01-31") == {}
+
+
+def test_cycle_time_follows_list_ids_across_renames_and_duplicate_names(tmp_path):
+    store = ProgressStore(str(tmp_path))
+    store.append(snapshot(0, list_names={"l1": "Todo", "l2": "Review"}, card_lists={"a": "l2"}))
+    store.append(snapshot(1, list_names={"l1": "Todo", "l2": "Review"}, card_lists={"a": "l1", "b": "l2"}))
+    # l1 is renamed and a second list called "Review" is created
+    names = {"l1": "Backlog", "l2": "Review", "l3": "Review"}
+    store.append(snapshot(3, list_names=names, card_lists={"a": "l3", "b": "l3"}))
+
+    def check(store):
+        result = [(ct.list_id, ct.list_name, ct.cards, ct.average_days) for ct in store.cycle_time("2026-01-01", "2026-01-31")]
+        assert result == [("l1", "Backlog", 1, 2.0), ("l2", "Review", 1, 2.0)]
+
+    check(store)
+    check(ProgressStore(str(tmp_path)))
+    # Unchanged names are not recorded again
+    assert store._name_rows == 4
+
+
+def test_build_snapshot_from_trello_data():
+    lists = [{"id": "l1", "name": "TODO"}, {"id": "l2", "name": "Done"}]
+    members = [{"id": "m1", "username": "alice"}, {"id": "m2", "username": "bob"}]
+    cards = [
+        {"id": "c1", "idList": "l1", "idMembers": ["m1"], "due": "2026-01-01T00:00:00.000Z", "dueComplete": False,
+         "actions": [{"idMemberCreator": "m2"}]},
+        {"id": "c2", "idList": "l1", "idMembers": [], "due": "2026-03-01T00:00:00.000Z", "dueComplete": False},
+        {"id": "c3", "idList": "l2", "idMembers": ["m1", "m2"], "due": "2026-01-01T00:00:00.000Z", "dueComplete": True},
+    ]
+
+    result = build_snapshot(cards, lists, members, taken_at=START, done_lists=["done"])
+
+    assert (result.open_cards, result.done_cards, result.due_cards, result.overdue_cards) == (2, 1, 2, 1)
+    assert result.list_names == {"l1": "TODO", "l2": "Done"}
+    assert result.list_cards == {"l1": 2, "l2": 1}
+    assert result.member_open == {"alice": 1}
+    assert result.member_done == {"alice": 1, "bob": 1}
+    assert result.done_lists == ["l2"]
+    assert result.card_members == {"c1": ["alice"], "c2": [], "c3": ["alice", "bob"]}
+    assert result.member_actions == {"bob": 1}
+    assert result.card_lists == {"c1": "l1", "c2": "l1", "c3": "l2"}